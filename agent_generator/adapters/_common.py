@@ -0,0 +1,27 @@
+"""
+Snippets shared by the framework adapters
+"""
+
+# Code placed before the generated code when it does not load API keys
+ENV_SETUP = """
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+# Set up API keys
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+"""
+
+# Code appended when the generated code does not configure logging
+LOGGING_SETUP = """
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+"""
+
+# Body of the generated .env.template file, below the adapter's heading
+ENV_TEMPLATE_BASE = """OPENAI_API_KEY=your_openai_api_key_here
+"""
+
+# python-dotenv is needed by every generated agent to load the .env file
+DOTENV_REQUIREMENT = {"python-dotenv": ">=1.0.0"}
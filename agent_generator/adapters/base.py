@@ -2,8 +2,42 @@
 Base adapter interface for framework adapters
 """
 
-from abc import ABC, abstractmethod
-from typing import Dict, Any
+import os
+import re
+from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Any, FrozenSet, Pattern, Set, Tuple
+
+from jinja2 import DictLoader, Environment, Template
+
+from agent_generator.adapters._common import ENV_SETUP, LOGGING_SETUP
+
+
+# Shared Jinja2 environment and compiled prompt templates, keyed by adapter class name
+_ENV = Environment(loader=DictLoader({}), auto_reload=False, cache_size=-1)
+_TEMPLATE_CACHE: Dict[str, Template] = {}
+
+
+def write_files(output_dir: str, files: Dict[str, str]) -> None:
+    """
+    Write several files into a directory concurrently
+    
+    The directory is created if it doesn't exist yet.
+    
+    Args:
+        output_dir: Directory to write the files to
+        files: Dictionary mapping file names to their contents
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    def _write(item):
+        name, content = item
+        Path(output_dir, name).write_text(content, encoding="utf-8")
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_write, files.items()))
 
 
 class BaseAdapter(ABC):
@@ -11,10 +45,78 @@ class BaseAdapter(ABC):
     Base class for framework adapters
     
     Framework adapters provide a standardized interface between
-    generated agents and the underlying frameworks.
+    generated agents and the underlying frameworks. The behaviour is
+    shared; each adapter only declares the framework-specific data below.
     """
     
-    @abstractmethod
+    # Name of the framework, as used by the factory and the selector
+    FRAMEWORK_NAME: str = ""
+    
+    # Jinja2 source of the prompt template, overridden by each adapter
+    PROMPT_TEMPLATE_SRC: str = ""
+    
+    # Imports that post-processing adds when the generated code lacks them
+    STANDARD_IMPORTS: Tuple[str, ...] = ()
+    
+    # Snippets whose presence means post-processing can skip a section
+    CODE_MARKERS: Tuple[str, ...] = (
+        "os.environ.get",
+        "os.getenv",
+        "logging.basicConfig",
+        "__main__"
+    )
+    
+    # Code placed before the generated code when it does not load API keys
+    ENV_SETUP: str = ENV_SETUP
+    
+    # Code appended when the generated code does not configure logging
+    LOGGING_SETUP: str = LOGGING_SETUP
+    
+    # Entry point appended when the generated code has none
+    MAIN_FUNCTION: str = ""
+    
+    # Contents of the generated .env.template file
+    ENV_TEMPLATE: str = ""
+    
+    # Contents of the generated README.md, with a {specs} placeholder
+    README_TEMPLATE: str = "{specs}"
+    
+    # Package names and version specifiers needed by generated agents
+    REQUIREMENTS: Dict[str, str] = {}
+    
+    _MARKERS_RE: Pattern[str]
+    _STANDARD_IMPORTS_SET: FrozenSet[str]
+    
+    def __init_subclass__(cls, **kwargs):
+        """
+        Compile the marker scanner once when an adapter class is defined
+        """
+        super().__init_subclass__(**kwargs)
+        cls._STANDARD_IMPORTS_SET = frozenset(cls.STANDARD_IMPORTS)
+        markers = sorted(set(cls.STANDARD_IMPORTS + cls.CODE_MARKERS), key=len, reverse=True)
+        # A lookahead group reports markers that overlap each other as well
+        cls._MARKERS_RE = re.compile("(?=(" + "|".join(map(re.escape, markers)) + "))")
+    
+    @classmethod
+    def _scan_markers(cls, code: str) -> Set[str]:
+        """
+        Find which standard imports and code markers occur in the code
+        
+        Args:
+            code: Code to scan
+            
+        Returns:
+            Set of the markers present in the code, found in a single pass
+        """
+        return {match.group(1) for match in cls._MARKERS_RE.finditer(code)}
+    
+    @cached_property
+    def _requirements_txt(self) -> str:
+        """
+        Contents of the requirements.txt file, rendered once from REQUIREMENTS
+        """
+        return "\n".join(f"{package}{version}" for package, version in self.REQUIREMENTS.items()) + "\n"
+    
     def get_framework_name(self) -> str:
         """
         Get the name of the framework
@@ -22,19 +124,24 @@ class BaseAdapter(ABC):
         Returns:
             Name of the framework
         """
-        pass
+        return self.FRAMEWORK_NAME
     
-    @abstractmethod
-    def get_prompt_template(self) -> str:
+    def get_prompt_template(self) -> Template:
         """
         Get the prompt template for generating code with this framework
         
+        The template is compiled once per adapter class and reused afterwards.
+        
         Returns:
-            Prompt template as a string
+            Compiled Jinja2 prompt template
         """
-        pass
+        cls = type(self)
+        template = _TEMPLATE_CACHE.get(cls.__name__)
+        if template is None:
+            template = _ENV.from_string(cls.PROMPT_TEMPLATE_SRC)
+            _TEMPLATE_CACHE[cls.__name__] = template
+        return template
     
-    @abstractmethod
     def post_process_code(self, code: str, specifications: Dict[str, Any]) -> str:
         """
         Post-process the generated code
@@ -46,9 +153,49 @@ class BaseAdapter(ABC):
         Returns:
             Post-processed code
         """
-        pass
+        present = self._scan_markers(code)
+        
+        # Add standard imports if not present, skipping the scan when all are
+        if present >= self._STANDARD_IMPORTS_SET:
+            prefix_parts = []
+        else:
+            prefix_parts = [
+                import_stmt for import_stmt in self.STANDARD_IMPORTS
+                if import_stmt not in present
+            ]
+        suffix_parts = []
+        
+        # Add environment variable loading if not present
+        if "os.environ.get" not in present and "os.getenv" not in present:
+            prefix_parts.append(self.ENV_SETUP)
+        
+        # Add logging setup if not present
+        if "logging.basicConfig" not in present:
+            suffix_parts.append(self.LOGGING_SETUP)
+        
+        # Add main function if not present
+        if "__main__" not in present:
+            suffix_parts.append(self.MAIN_FUNCTION)
+        
+        # Assemble the final code with a single join
+        return "\n".join(prefix_parts + [code] + suffix_parts)
+    
+    def get_additional_files(self, agent_data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Get any additional files required by the framework
+        
+        Args:
+            agent_data: Dictionary containing the generated agent data
+            
+        Returns:
+            Dictionary mapping file names to their contents
+        """
+        return {
+            ".env.template": self.ENV_TEMPLATE,
+            "README.md": self.README_TEMPLATE.format(specs=agent_data["specifications"]),
+            "requirements.txt": self._requirements_txt
+        }
     
-    @abstractmethod
     def save_additional_files(self, agent_data: Dict[str, Any], output_dir: str) -> None:
         """
         Save any additional files required by the framework
@@ -57,9 +204,8 @@ class BaseAdapter(ABC):
             agent_data: Dictionary containing the generated agent data
             output_dir: Directory to save the files to
         """
-        pass
+        write_files(output_dir, self.get_additional_files(agent_data))
     
-    @abstractmethod
     def get_requirements(self) -> Dict[str, str]:
         """
         Get the requirements for this framework
@@ -67,4 +213,4 @@ class BaseAdapter(ABC):
         Returns:
             Dictionary of package names and versions
         """
-        pass
+        return self.REQUIREMENTS
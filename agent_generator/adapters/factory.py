@@ -2,13 +2,10 @@
 Factory for creating framework adapters
 """
 
-from typing import Dict, Type
+import importlib
+from typing import Dict, Tuple, Type, Union
 
 from agent_generator.adapters.base import BaseAdapter
-from agent_generator.adapters.llamaindex_adapter import LlamaIndexAdapter
-from agent_generator.adapters.langchain_adapter import LangChainAdapter
-from agent_generator.adapters.smallagents_adapter import SmallAgentsAdapter
-from agent_generator.adapters.openai_assistants_adapter import OpenAIAssistantsAdapter
 
 
 class AdapterFactory:
@@ -19,13 +16,19 @@ class AdapterFactory:
     def __init__(self):
         """
         Initialize the adapter factory
+        
+        Adapter modules are only imported the first time their framework is
+        requested, so unused frameworks cost nothing at startup.
         """
-        self.adapters: Dict[str, Type[BaseAdapter]] = {
-            "llamaindex": LlamaIndexAdapter,
-            "langchain": LangChainAdapter,
-            "smallagents": SmallAgentsAdapter,
-            "openai_assistants": OpenAIAssistantsAdapter
+        self.adapters: Dict[str, Union[Tuple[str, str], Type[BaseAdapter]]] = {
+            "llamaindex": ("agent_generator.adapters.llamaindex_adapter", "LlamaIndexAdapter"),
+            "langchain": ("agent_generator.adapters.langchain_adapter", "LangChainAdapter"),
+            "smallagents": ("agent_generator.adapters.smallagents_adapter", "SmallAgentsAdapter"),
+            "openai_assistants": ("agent_generator.adapters.openai_assistants_adapter", "OpenAIAssistantsAdapter")
         }
+        
+        # Adapters are stateless, so one instance per framework is shared
+        self._instances: Dict[str, BaseAdapter] = {}
     
     def get_adapter(self, framework: str) -> BaseAdapter:
         """
@@ -35,12 +38,24 @@ class AdapterFactory:
             framework: Name of the framework
             
         Returns:
-            Adapter instance for the framework
+            Shared adapter instance for the framework
             
         Raises:
             ValueError: If the framework is not supported
         """
+        adapter = self._instances.get(framework)
+        if adapter is not None:
+            return adapter
+        
         if framework not in self.adapters:
             raise ValueError(f"Unsupported framework: {framework}")
         
-        return self.adapters[framework]()
+        adapter_class = self.adapters[framework]
+        if isinstance(adapter_class, tuple):
+            module_path, class_name = adapter_class
+            adapter_class = getattr(importlib.import_module(module_path), class_name)
+            self.adapters[framework] = adapter_class
+        
+        adapter = adapter_class()
+        self._instances[framework] = adapter
+        return adapter
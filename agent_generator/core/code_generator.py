@@ -2,17 +2,43 @@
 Code Generator module for generating agent code
 """
 
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Hashable, Optional
 
 from agent_generator.core.llm_provider import LLMProvider
 from agent_generator.adapters.base import BaseAdapter
 
 
+def _freeze(value: Any) -> Hashable:
+    """
+    Recursively convert a specification value into a hashable key
+    
+    Args:
+        value: Specification value (dict, list or scalar)
+        
+    Returns:
+        Hashable representation of the value
+    """
+    if isinstance(value, dict):
+        return (dict, tuple((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(item) for item in value))
+    if isinstance(value, set):
+        return (set, frozenset(_freeze(item) for item in value))
+    return value
+
+
 class CodeGenerator:
     """
     Generator for creating agent code based on specifications and framework adapters
     """
     
+    # Maximum number of formatted specifications to keep
+    FORMAT_CACHE_SIZE = 128
+    
+    # Maximum number of generated agents to keep
+    GENERATION_CACHE_SIZE = 256
+    
     def __init__(self, llm_provider: LLMProvider):
         """
         Initialize the code generator
@@ -21,60 +47,167 @@ class CodeGenerator:
             llm_provider: LLM provider for generating code
         """
         self.llm_provider = llm_provider
+        self._format_cache: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._gen_cache: "OrderedDict[Hashable, str]" = OrderedDict()
     
-    def generate(self, specifications: Dict[str, Any], adapter: BaseAdapter) -> str:
+    def generate(self, specifications: Dict[str, Any], adapter: BaseAdapter,
+                 stream_callback: Optional[Callable[[str], None]] = None) -> str:
         """
         Generate agent code based on specifications and adapter
         
+        Identical specifications for the same framework are served from an
+        in-memory cache without calling the LLM again.
+        
         Args:
             specifications: Dictionary containing user specifications for the agent
             adapter: Framework adapter to use for code generation
+            stream_callback: Optional function called with each chunk of raw code as it arrives
             
         Returns:
             Generated code as a string
         """
+        key = (adapter.get_framework_name(), _freeze(specifications))
+        cached_code = self._get_cached_code(key)
+        if cached_code is not None:
+            return cached_code
+        
+        # Generate code using the LLM provider with the framework-specific prompt
+        code = self.llm_provider.generate_code(
+            specifications, 
+            language=specifications.get("language") or "python",
+            prompt=self._render_prompt(specifications, adapter),
+            stream_callback=stream_callback
+        )
+        
+        return self._post_process(key, code, specifications, adapter)
+    
+    async def agenerate(self, specifications: Dict[str, Any], adapter: BaseAdapter) -> str:
+        """
+        Generate agent code without blocking the event loop
+        
+        Args:
+            specifications: Dictionary containing user specifications for the agent
+            adapter: Framework adapter to use for code generation
+            
+        Returns:
+            Generated code as a string
+        """
+        key = (adapter.get_framework_name(), _freeze(specifications))
+        cached_code = self._get_cached_code(key)
+        if cached_code is not None:
+            return cached_code
+        
+        code = await self.llm_provider.agenerate_code(
+            specifications,
+            language=specifications.get("language") or "python",
+            prompt=self._render_prompt(specifications, adapter)
+        )
+        
+        return self._post_process(key, code, specifications, adapter)
+    
+    def _render_prompt(self, specifications: Dict[str, Any], adapter: BaseAdapter) -> str:
+        """
+        Render the adapter's prompt template with the specifications
+        
+        Args:
+            specifications: Dictionary containing user specifications for the agent
+            adapter: Framework adapter to use for code generation
+            
+        Returns:
+            Prompt for the LLM
+        """
         # Get the prompt template from the adapter
         prompt_template = adapter.get_prompt_template()
         
         # Prepare the prompt with specifications
-        prompt = prompt_template.format(
+        return prompt_template.render(
             specifications=self._format_specifications(specifications),
             framework=adapter.get_framework_name(),
-            language=specifications.get("language", "python")
+            language=specifications.get("language") or "python"
         )
+    
+    def _get_cached_code(self, key: Hashable) -> Optional[str]:
+        """
+        Look up previously generated code
         
-        # Generate code using the LLM provider
-        code = self.llm_provider.generate_code(
-            specifications, 
-            language=specifications.get("language", "python")
-        )
+        Args:
+            key: Cache key built from the framework and the specifications
+            
+        Returns:
+            Cached code, or None if the agent hasn't been generated yet
+        """
+        cached_code = self._gen_cache.get(key)
+        if cached_code is not None:
+            self._gen_cache.move_to_end(key)
+        return cached_code
+    
+    def _post_process(self, key: Hashable, code: str, specifications: Dict[str, Any],
+                      adapter: BaseAdapter) -> str:
+        """
+        Post-process generated code and cache the result
         
+        Args:
+            key: Cache key built from the framework and the specifications
+            code: Generated code from the LLM
+            specifications: Dictionary containing user specifications for the agent
+            adapter: Framework adapter to use for post-processing
+            
+        Returns:
+            Post-processed code
+        """
         # Post-process the code with the adapter
         processed_code = adapter.post_process_code(code, specifications)
         
+        self._gen_cache[key] = processed_code
+        if len(self._gen_cache) > self.GENERATION_CACHE_SIZE:
+            self._gen_cache.popitem(last=False)
+        
         return processed_code
     
     def _format_specifications(self, specifications: Dict[str, Any]) -> str:
         """
         Format specifications for inclusion in the prompt
         
+        Results are cached by the frozen contents of the specifications.
+        
         Args:
             specifications: Dictionary containing user specifications for the agent
             
         Returns:
             Formatted specifications as a string
         """
-        formatted = ""
-        for key, value in specifications.items():
-            if isinstance(value, dict):
-                formatted += f"{key}:\n"
-                for sub_key, sub_value in value.items():
-                    formatted += f"  {sub_key}: {sub_value}\n"
-            elif isinstance(value, list):
-                formatted += f"{key}:\n"
-                for item in value:
-                    formatted += f"  - {item}\n"
-            else:
-                formatted += f"{key}: {value}\n"
+        key = _freeze(specifications)
+        formatted = self._format_cache.get(key)
+        if formatted is not None:
+            self._format_cache.move_to_end(key)
+            return formatted
+        
+        formatted = self._format_uncached(specifications)
+        self._format_cache[key] = formatted
+        if len(self._format_cache) > self.FORMAT_CACHE_SIZE:
+            self._format_cache.popitem(last=False)
         
         return formatted
+    
+    def _format_uncached(self, specifications: Dict[str, Any]) -> str:
+        """
+        Format specifications without consulting the cache
+        
+        Args:
+            specifications: Dictionary containing user specifications for the agent
+            
+        Returns:
+            Formatted specifications as a string
+        """
+        def _iter_lines(spec):
+            for key, value in spec.items():
+                if isinstance(value, dict):
+                    yield f"{key}:\n"
+                    yield from (f"  {sub_key}: {sub_value}\n" for sub_key, sub_value in value.items())
+                elif isinstance(value, list):
+                    yield f"{key}:\n"
+                    yield from (f"  - {item}\n" for item in value)
+                else:
+                    yield f"{key}: {value}\n"
+        
+        return "".join(_iter_lines(specifications))
@@ -2,13 +2,16 @@
 Core engine for generating LLM agents
 """
 
-import os
-from typing import Dict, List, Optional, Any
+import asyncio
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Any, Union
 
+from agent_generator.core.llm_cache import LLMCache
 from agent_generator.core.llm_provider import LLMProvider
 from agent_generator.core.code_generator import CodeGenerator
 from agent_generator.core.framework_selector import FrameworkSelector
-from agent_generator.adapters.base import BaseAdapter
+from agent_generator.core.spec import AgentSpec
+from agent_generator.adapters.base import BaseAdapter, write_files
 from agent_generator.adapters.factory import AdapterFactory
 
 
@@ -17,28 +20,64 @@ class AgentGenerationEngine:
     Main engine for generating LLM agents based on user specifications
     """
     
-    def __init__(self, model: str = "gpt-4"):
+    def __init__(self, model: str = "gpt-4", cache: Optional[LLMCache] = None,
+                 fast_model: Optional[str] = None):
         """
         Initialize the agent generation engine
         
         Args:
             model: The LLM model to use for generation (gpt-4 or claude)
+            cache: Optional cache for LLM responses
+            fast_model: Optional cheaper model to generate code for simple specifications with
         """
-        self.llm_provider = LLMProvider(model)
-        self.code_generator = CodeGenerator(self.llm_provider)
-        self.framework_selector = FrameworkSelector(self.llm_provider)
-        self.adapter_factory = AdapterFactory()
+        # Components are built on first access, so flows that never call
+        # the LLM (e.g. saving existing agent data) don't create API clients
+        self.model = model
+        self.cache = cache
+        self.fast_model = fast_model
     
-    def generate_agent(self, specifications: Dict[str, Any]) -> Dict[str, Any]:
+    @cached_property
+    def llm_provider(self) -> LLMProvider:
+        """
+        LLM provider used for framework selection and code generation
+        """
+        return LLMProvider(self.model, cache=self.cache, fast_model=self.fast_model)
+    
+    @cached_property
+    def code_generator(self) -> CodeGenerator:
+        """
+        Code generator backed by the LLM provider
+        """
+        return CodeGenerator(self.llm_provider)
+    
+    @cached_property
+    def framework_selector(self) -> FrameworkSelector:
+        """
+        Framework selector backed by the LLM provider
+        """
+        return FrameworkSelector(self.llm_provider)
+    
+    @cached_property
+    def adapter_factory(self) -> AdapterFactory:
+        """
+        Factory for the framework adapters
+        """
+        return AdapterFactory()
+    
+    def generate_agent(self, specifications: Union[AgentSpec, Dict[str, Any]],
+                       stream_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         Generate an agent based on user specifications
         
         Args:
-            specifications: Dictionary containing user specifications for the agent
+            specifications: User specifications for the agent, as an AgentSpec or dictionary
+            stream_callback: Optional function called with each chunk of raw code as it arrives
             
         Returns:
             Dictionary containing generated code and related information
         """
+        specifications = self._as_dict(specifications)
+        
         # Determine the most appropriate framework based on specifications
         framework = self.framework_selector.select_framework(specifications)
         
@@ -46,12 +85,114 @@ class AgentGenerationEngine:
         adapter = self.adapter_factory.get_adapter(framework)
         
         # Generate code using the adapter and specifications
-        code = self.code_generator.generate(specifications, adapter)
+        code = self.code_generator.generate(specifications, adapter, stream_callback=stream_callback)
         
+        return self._build_agent_data(framework, code, specifications, adapter)
+    
+    async def agenerate_agents(self, specifications_list: List[Union[AgentSpec, Dict[str, Any]]]
+                               ) -> List[Dict[str, Any]]:
+        """
+        Generate several agents, running their code generation concurrently
+        
+        Framework selection for all specifications is batched into at most one
+        LLM request; the code generation requests are then issued together.
+        A failed code generation doesn't affect the other agents.
+        
+        Args:
+            specifications_list: List of agent specifications, as AgentSpecs or dictionaries
+            
+        Returns:
+            List of generated agent data, in the same order as the specifications.
+            Agents whose code generation failed have "code" set to None and the
+            failure in "error".
+        """
+        specifications_list = [self._as_dict(specifications) for specifications in specifications_list]
+        frameworks = await self.framework_selector.aselect_frameworks(specifications_list)
+        adapters = [self.adapter_factory.get_adapter(framework) for framework in frameworks]
+        
+        results = await asyncio.gather(*(
+            self.code_generator.agenerate(specifications, adapter)
+            for specifications, adapter in zip(specifications_list, adapters)
+        ), return_exceptions=True)
+        
+        agents = []
+        for framework, result, specifications, adapter in zip(frameworks, results, specifications_list, adapters):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                agent_data = self._build_agent_data(framework, None, specifications, adapter)
+                agent_data["error"] = f"{type(result).__name__}: {result}"
+            else:
+                agent_data = self._build_agent_data(framework, result, specifications, adapter)
+            agents.append(agent_data)
+        
+        return agents
+    
+    def generate_agents_batch(self, specifications_list: List[Union[AgentSpec, Dict[str, Any]]]
+                              ) -> List[Dict[str, Any]]:
+        """
+        Generate several agents in one batch
+        
+        Args:
+            specifications_list: List of agent specifications, as AgentSpecs or dictionaries
+            
+        Returns:
+            List of generated agent data, in the same order as the specifications
+        """
+        return asyncio.run(self._agenerate_agents_and_close(specifications_list))
+    
+    async def _agenerate_agents_and_close(self, specifications_list: List[Union[AgentSpec, Dict[str, Any]]]
+                                          ) -> List[Dict[str, Any]]:
+        """
+        Generate several agents, then close the async client
+        
+        The async client can't outlive the event loop that asyncio.run creates
+        for the batch, so it is closed before that loop is.
+        
+        Args:
+            specifications_list: List of agent specifications, as AgentSpecs or dictionaries
+            
+        Returns:
+            List of generated agent data, in the same order as the specifications
+        """
+        try:
+            return await self.agenerate_agents(specifications_list)
+        finally:
+            await self.llm_provider.aclose()
+    
+    def _as_dict(self, specifications: Union[AgentSpec, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get the dictionary form of agent specifications
+        
+        Args:
+            specifications: User specifications for the agent, as an AgentSpec or dictionary
+            
+        Returns:
+            Dictionary containing user specifications for the agent
+        """
+        if isinstance(specifications, AgentSpec):
+            return specifications.to_dict()
+        return specifications
+    
+    def _build_agent_data(self, framework: str, code: Optional[str], specifications: Dict[str, Any],
+                          adapter: BaseAdapter) -> Dict[str, Any]:
+        """
+        Bundle the generated code and related information
+        
+        Args:
+            framework: Name of the selected framework
+            code: Generated agent code
+            specifications: Dictionary containing user specifications for the agent
+            adapter: Adapter used to generate the code
+            
+        Returns:
+            Dictionary containing generated code and related information
+        """
         return {
             "framework": framework,
             "code": code,
-            "specifications": specifications
+            "specifications": specifications,
+            "_adapter": adapter
         }
     
     def save_agent(self, agent_data: Dict[str, Any], output_dir: str) -> str:
@@ -65,16 +206,14 @@ class AgentGenerationEngine:
         Returns:
             Path to the saved agent
         """
-        # Create the output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Save the agent code to the output directory
-        code_file = os.path.join(output_dir, "agent.py")
-        with open(code_file, "w") as f:
-            f.write(agent_data["code"])
+        # Collect any additional files required by the adapter, reusing the one
+        # from generate_agent when available
+        adapter = agent_data.get("_adapter") or self.adapter_factory.get_adapter(agent_data["framework"])
+        files = {"agent.py": agent_data["code"]}
+        files.update(adapter.get_additional_files(agent_data))
         
-        # Save any additional files required by the adapter
-        adapter = self.adapter_factory.get_adapter(agent_data["framework"])
-        adapter.save_additional_files(agent_data, output_dir)
+        # Write the agent code and the additional files together, creating
+        # the output directory if it doesn't exist
+        write_files(output_dir, files)
         
         return output_dir
@@ -2,7 +2,12 @@
 Framework Selector module for determining the most appropriate framework
 """
 
-from typing import Dict, Any
+import re
+import json
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from rapidfuzz import fuzz, process, utils
 
 from agent_generator.core.llm_provider import LLMProvider
 
@@ -14,6 +19,37 @@ class FrameworkSelector:
     
     FRAMEWORKS = ["llamaindex", "langchain", "smallagents", "openai_assistants"]
     
+    ANALYSIS_SYSTEM_PROMPT = """You are an expert in LLM agent frameworks. Your task is to analyze the
+provided specifications and recommend the most appropriate framework from the following options:
+- LlamaIndex: Best for document retrieval and RAG applications
+- LangChain: Best for workflow and chain-of-thought operations
+- SmallAgents: Best for lightweight, specific-purpose agents
+- OpenAI Assistants: Best for leveraging OpenAI's agent capabilities
+
+Respond with ONLY a JSON object of the form {"framework": "<name>"}, where <name> is one of
+llamaindex, langchain, smallagents or openai_assistants, with no additional text."""
+    
+    # Use case word stems that strongly suggest a framework; a word matches
+    # when it starts with a stem, so inflections like "documents" count
+    USE_CASE_KEYWORDS = {
+        "llamaindex": ("document", "retrieval", "rag"),
+        "langchain": ("workflow", "chain", "orchestration"),
+        "smallagents": ("lightweight", "simple", "specific"),
+        "openai_assistants": ("openai", "function_calling", "vision")
+    }
+    
+    # Splits a lowercased use case into words for the keyword check
+    _WORD_RE = re.compile(r"[a-z_]+")
+    
+    # Score lead over the runner-up at which rule-based selection is trusted
+    # even for complex specifications
+    CLEAR_WINNER_MARGIN = 1.5
+    
+    # Minimum token_sort_ratio for a capability to fuzzily match a capability
+    # name. The whole strings are compared, so a single word shared with a
+    # longer name (e.g. "agent" and "agent_orchestration") doesn't match.
+    FUZZY_MATCH_THRESHOLD = 80
+    
     def __init__(self, llm_provider: LLMProvider):
         """
         Initialize the framework selector
@@ -53,6 +89,29 @@ class FrameworkSelector:
                 "vision": 0.8
             }
         }
+        
+        # Flat, parallel views of the capabilities, built once so scoring is a
+        # lookup by position instead of a walk over the nested dict. Capability
+        # names are unique across frameworks.
+        self._cap_names: List[str] = []
+        self._cap_scores: List[float] = []
+        self._cap_fw_idx: List[int] = []
+        for fw_idx, framework in enumerate(self.FRAMEWORKS):
+            for cap_name, cap_score in self.framework_capabilities[framework].items():
+                self._cap_names.append(cap_name)
+                self._cap_scores.append(cap_score)
+                self._cap_fw_idx.append(fw_idx)
+        
+        # Multi-pattern matcher that finds every capability name in a string in
+        # one pass; each name has its own group, so a match maps back to its
+        # position. No name is a prefix of another.
+        self._cap_re = self._compile_matcher(self._cap_names)
+        
+        # Matches the first framework name in an LLM response
+        self._fw_re = re.compile(r"\b(" + "|".join(map(re.escape, self.FRAMEWORKS)) + r")\b", re.IGNORECASE)
+        
+        # Rule-based scoring is pure, so results are memoized per instance
+        self._compute_scores_cached = lru_cache(maxsize=1024)(self._compute_scores)
     
     def select_framework(self, specifications: Dict[str, Any]) -> str:
         """
@@ -64,18 +123,90 @@ class FrameworkSelector:
         Returns:
             Name of the selected framework
         """
+        framework = self._preselect_framework(specifications)
+        if framework is not None:
+            return framework
+        
+        # Use LLM to analyze complex requirements
+        return self._analyze_with_llm(specifications)
+    
+    def select_frameworks(self, specifications_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Select the most appropriate framework for several specifications
+        
+        Specifications that need LLM analysis are sent in a single batched request.
+        
+        Args:
+            specifications_list: List of dictionaries containing agent specifications
+            
+        Returns:
+            Names of the selected frameworks, in the same order as the specifications
+        """
+        frameworks: List[Optional[str]] = [
+            self._preselect_framework(specifications) for specifications in specifications_list
+        ]
+        
+        pending = [i for i, framework in enumerate(frameworks) if framework is None]
+        if pending:
+            selected = self._analyze_with_llm_batch([specifications_list[i] for i in pending])
+            for i, framework in zip(pending, selected):
+                frameworks[i] = framework
+        
+        return frameworks
+    
+    async def aselect_frameworks(self, specifications_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Select the most appropriate framework for several specifications without
+        blocking the event loop
+        
+        Specifications that need LLM analysis are sent in a single batched request.
+        
+        Args:
+            specifications_list: List of dictionaries containing agent specifications
+            
+        Returns:
+            Names of the selected frameworks, in the same order as the specifications
+        """
+        frameworks: List[Optional[str]] = [
+            self._preselect_framework(specifications) for specifications in specifications_list
+        ]
+        
+        pending = [i for i, framework in enumerate(frameworks) if framework is None]
+        if pending:
+            responses = await self.llm_provider.agenerate_batch(
+                [self._build_analysis_prompt(specifications_list[i]) for i in pending],
+                self.ANALYSIS_SYSTEM_PROMPT,
+                temperature=0.1
+            )
+            for i, response in zip(pending, responses):
+                frameworks[i] = self._parse_framework(response)
+        
+        return frameworks
+    
+    def _preselect_framework(self, specifications: Dict[str, Any]) -> Optional[str]:
+        """
+        Select a framework without calling the LLM, if possible
+        
+        Args:
+            specifications: Dictionary containing user specifications for the agent
+            
+        Returns:
+            Name of the selected framework, or None if LLM analysis is needed
+        """
         # Check if the user explicitly specified a framework
-        if "framework" in specifications:
-            requested_framework = specifications["framework"].lower()
-            if requested_framework in self.FRAMEWORKS:
-                return requested_framework
+        requested_framework = specifications.get("framework")
+        if isinstance(requested_framework, str) and requested_framework.lower() in self.FRAMEWORKS:
+            return requested_framework.lower()
         
-        # Use LLM to analyze requirements if complex
-        if self._is_complex_specification(specifications):
-            return self._analyze_with_llm(specifications)
+        # Use rule-based selection unless the requirements are complex and
+        # the scores don't show a clear winner
+        ranked = self._rank_frameworks(specifications)
+        if (ranked[0][1] - ranked[1][1] >= self.CLEAR_WINNER_MARGIN
+                or not self._is_complex_specification(specifications)):
+            return ranked[0][0]
         
-        # Otherwise use rule-based selection
-        return self._rule_based_selection(specifications)
+        # Leave the rest to the LLM
+        return None
     
     def _is_complex_specification(self, specifications: Dict[str, Any]) -> bool:
         """
@@ -88,12 +219,12 @@ class FrameworkSelector:
             True if complex, False otherwise
         """
         # Check if there are multiple capabilities requested
-        capabilities = specifications.get("capabilities", [])
+        capabilities = specifications.get("capabilities") or []
         if isinstance(capabilities, list) and len(capabilities) > 3:
             return True
         
         # Check if there are custom requirements
-        if "custom_requirements" in specifications:
+        if specifications.get("custom_requirements") is not None:
             return True
         
         return False
@@ -108,29 +239,69 @@ class FrameworkSelector:
         Returns:
             Name of the selected framework
         """
-        system_prompt = """You are an expert in LLM agent frameworks. Your task is to analyze the
-provided specifications and recommend the most appropriate framework from the following options:
-- LlamaIndex: Best for document retrieval and RAG applications
-- LangChain: Best for workflow and chain-of-thought operations
-- SmallAgents: Best for lightweight, specific-purpose agents
-- OpenAI Assistants: Best for leveraging OpenAI's agent capabilities
-
-Respond with ONLY the name of the recommended framework in lowercase, with no additional text."""
+        response = self.llm_provider.generate(
+            self._build_analysis_prompt(specifications), self.ANALYSIS_SYSTEM_PROMPT,
+            temperature=0.1, json_mode=True
+        )
+        return self._parse_framework(response)
+    
+    def _analyze_with_llm_batch(self, specifications_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Use the LLM to analyze several specifications in a single request
         
-        prompt = f"""Based on the following agent specifications, which framework would be most appropriate?
+        Args:
+            specifications_list: List of dictionaries containing agent specifications
+            
+        Returns:
+            Names of the selected frameworks, in the same order as the specifications
+        """
+        responses = self.llm_provider.generate_batch(
+            [self._build_analysis_prompt(specifications) for specifications in specifications_list],
+            self.ANALYSIS_SYSTEM_PROMPT,
+            temperature=0.1
+        )
+        return [self._parse_framework(response) for response in responses]
+    
+    def _build_analysis_prompt(self, specifications: Dict[str, Any]) -> str:
+        """
+        Build the prompt asking the LLM to recommend a framework
+        
+        Args:
+            specifications: Dictionary containing user specifications for the agent
+            
+        Returns:
+            Prompt for the LLM
+        """
+        return f"""Based on the following agent specifications, which framework would be most appropriate?
 
 Specifications:
-{specifications}
+{json.dumps(specifications, indent=2, default=str)}
 
 Consider the strengths and weaknesses of each framework and choose the one that best aligns with these requirements."""
+    
+    def _parse_framework(self, response: str) -> str:
+        """
+        Parse the framework name from an LLM response
         
-        response = self.llm_provider.generate(prompt, system_prompt, temperature=0.1)
+        Expects a {"framework": ...} JSON object, but falls back to finding a
+        framework name anywhere in the text.
         
-        # Parse the response to get the framework name
-        response = response.strip().lower()
-        for framework in self.FRAMEWORKS:
-            if framework in response:
-                return framework
+        Args:
+            response: Response from the LLM
+            
+        Returns:
+            Name of the recommended framework
+        """
+        try:
+            parsed = json.loads(response)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict) and isinstance(parsed.get("framework"), str):
+            response = parsed["framework"]
+        
+        match = self._fw_re.search(response)
+        if match:
+            return match.group(1).lower()
         
         # Default to langchain if the response doesn't match any framework
         return "langchain"
@@ -145,39 +316,101 @@ Consider the strengths and weaknesses of each framework and choose the one that
         Returns:
             Name of the selected framework
         """
-        scores = {framework: 0.0 for framework in self.FRAMEWORKS}
+        return self._rank_frameworks(specifications)[0][0]
+    
+    def _rank_frameworks(self, specifications: Dict[str, Any]) -> Tuple[Tuple[str, float], ...]:
+        """
+        Rank the frameworks by their rule-based scores
         
+        Args:
+            specifications: Dictionary containing user specifications for the agent
+            
+        Returns:
+            (framework, score) pairs, highest score first
+        """
         # Extract relevant information from specifications
-        capabilities = specifications.get("capabilities", [])
-        use_case = specifications.get("use_case", "")
+        capabilities = specifications.get("capabilities") or []
+        use_case = specifications.get("use_case") or ""
+        
+        # Normalize into a hashable key so repeated specs hit the cache
+        return self._compute_scores_cached(
+            tuple(sorted(capability.lower() for capability in capabilities)),
+            use_case.lower()
+        )
+    
+    def _compute_scores(self, capabilities: Tuple[str, ...], use_case: str) -> Tuple[Tuple[str, float], ...]:
+        """
+        Score the frameworks against normalized capabilities and use case
+        
+        Args:
+            capabilities: Sorted, lowercased capabilities
+            use_case: Lowercased use case description
+            
+        Returns:
+            (framework, score) pairs, highest score first; ties keep FRAMEWORKS order
+        """
+        # Scores indexed like FRAMEWORKS
+        scores = [0.0] * len(self.FRAMEWORKS)
         
         # Score each framework based on capabilities
         for capability in capabilities:
-            capability = capability.lower()
-            for framework, framework_caps in self.framework_capabilities.items():
-                for cap_name, cap_score in framework_caps.items():
-                    if cap_name in capability:
-                        scores[framework] += cap_score
+            matches = self._match_indexes(self._cap_re, capability) or self._fuzzy_match(capability)
+            for i in matches:
+                scores[self._cap_fw_idx[i]] += self._cap_scores[i]
         
         # Score based on use case
-        use_case = use_case.lower()
-        for framework, framework_caps in self.framework_capabilities.items():
-            for cap_name, cap_score in framework_caps.items():
-                if cap_name in use_case:
-                    scores[framework] += cap_score * 0.5  # Lower weight for use case
+        for i in self._match_indexes(self._cap_re, use_case):
+            scores[self._cap_fw_idx[i]] += self._cap_scores[i] * 0.5  # Lower weight for use case
         
         # Check for specific requirements
-        if "document" in use_case or "retrieval" in use_case or "rag" in use_case:
-            scores["llamaindex"] += 2.0
+        words = frozenset(self._WORD_RE.findall(use_case))
+        for fw_idx, framework in enumerate(self.FRAMEWORKS):
+            if any(word.startswith(self.USE_CASE_KEYWORDS[framework]) for word in words):
+                scores[fw_idx] += 2.0
         
-        if "workflow" in use_case or "chain" in use_case or "orchestration" in use_case:
-            scores["langchain"] += 2.0
+        # Rank the frameworks by score
+        return tuple(sorted(zip(self.FRAMEWORKS, scores), key=lambda x: -x[1]))
+    
+    def _fuzzy_match(self, capability: str) -> List[int]:
+        """
+        Find the capability name closest to a capability with no exact match
         
-        if "lightweight" in use_case or "simple" in use_case or "specific" in use_case:
-            scores["smallagents"] += 2.0
+        Args:
+            capability: Lowercased capability
+            
+        Returns:
+            Position of the best matching capability name, or an empty list if none is close enough
+        """
+        match = process.extractOne(
+            capability, self._cap_names, scorer=fuzz.token_sort_ratio, processor=utils.default_process,
+            score_cutoff=self.FUZZY_MATCH_THRESHOLD
+        )
+        return [match[2]] if match else []
+    
+    @staticmethod
+    def _compile_matcher(patterns: List[str]) -> "re.Pattern[str]":
+        """
+        Compile literal patterns into a single overlapping multi-pattern matcher
         
-        if "openai" in use_case or "function_calling" in use_case or "vision" in use_case:
-            scores["openai_assistants"] += 2.0
+        Args:
+            patterns: Literal strings to search for
+            
+        Returns:
+            Compiled regular expression with one group per pattern
+        """
+        alternatives = "|".join(f"({re.escape(pattern)})" for pattern in patterns)
+        return re.compile(f"(?=(?:{alternatives}))")
+    
+    @staticmethod
+    def _match_indexes(matcher: "re.Pattern[str]", text: str) -> List[int]:
+        """
+        Find which patterns of a matcher occur in the text
         
-        # Return the framework with the highest score
-        return max(scores.items(), key=lambda x: x[1])[0]
+        Args:
+            matcher: Matcher built by _compile_matcher
+            text: Text to search
+            
+        Returns:
+            Sorted positions of the patterns found in the text
+        """
+        return sorted({match.lastindex - 1 for match in matcher.finditer(text)})
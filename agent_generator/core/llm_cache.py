@@ -0,0 +1,116 @@
+"""
+LLM Cache module for reusing responses to identical requests
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Any
+
+import diskcache
+
+
+class DiskCacheBackend:
+    """
+    Cache backend that stores responses on disk
+    """
+    
+    def __init__(self, directory: str = "~/.agent_generator/llm_cache"):
+        """
+        Initialize the disk cache backend
+        
+        Args:
+            directory: Directory to store the cached responses in
+        """
+        self._cache = diskcache.Cache(os.path.expanduser(directory))
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response
+        
+        Args:
+            key: Cache key of the request
+            
+        Returns:
+            Cached response, or None if not cached
+        """
+        return self._cache.get(key)
+    
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        """
+        Store a response
+        
+        Args:
+            key: Cache key of the request
+            value: Response to cache
+            ttl: Time to live in seconds, or None to keep it indefinitely
+        """
+        self._cache.set(key, value, expire=ttl)
+
+
+class LLMCache:
+    """
+    Cache for LLM responses keyed by a hash of the request
+    """
+    
+    # Requests sampled above this temperature are not cached
+    MAX_CACHEABLE_TEMPERATURE = 0.3
+    
+    def __init__(self, backend: Optional[Any] = None, ttl: int = 3600):
+        """
+        Initialize the LLM cache
+        
+        Args:
+            backend: Storage backend with get/set methods (disk cache by default)
+            ttl: Time to live of cached responses in seconds
+        """
+        self.backend = backend if backend is not None else DiskCacheBackend()
+        self.ttl = ttl
+    
+    def cache_key(self, model: str, messages: List[Dict[str, Any]], temperature: float,
+                  tools: Optional[List[Dict[str, Any]]] = None) -> Optional[str]:
+        """
+        Compute the cache key for a request
+        
+        Args:
+            model: Name of the model
+            messages: Messages sent to the model
+            temperature: Sampling temperature of the request
+            tools: Optional tool definitions sent with the request
+            
+        Returns:
+            SHA-256 hex digest of the request, or None if the request is too
+            random to be cached
+        """
+        if temperature > self.MAX_CACHEABLE_TEMPERATURE:
+            return None
+        
+        payload = json.dumps({
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "tools": tools
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response
+        
+        Args:
+            key: Cache key of the request
+            
+        Returns:
+            Cached response, or None if not cached
+        """
+        return self.backend.get(key)
+    
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response
+        
+        Args:
+            key: Cache key of the request
+            value: Response to cache
+        """
+        self.backend.set(key, value, self.ttl)
@@ -3,10 +3,18 @@ LLM Provider module for interacting with language models
 """
 
 import os
-from typing import Dict, List, Optional, Any
+import re
+import logging
+import json
+import asyncio
+import hashlib
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
 
-import openai
-from anthropic import Anthropic
+import httpx
+
+from agent_generator.core.llm_cache import LLMCache
+
+logger = logging.getLogger(__name__)
 
 
 class LLMProvider:
@@ -14,25 +22,77 @@ class LLMProvider:
     Provider for interacting with different language models
     """
     
-    def __init__(self, model: str = "gpt-4"):
+    # Instructions appended to the system prompt of batched requests
+    BATCH_INSTRUCTIONS = """You will receive several independent inputs, each starting with a tag like [1].
+Answer each input separately. Start every answer on a new line with the tag of its input,
+formatted as `[i] answer`, and give exactly one answer per input."""
+    
+    # Matches the tag that starts each answer in a batched response
+    _BATCH_ANSWER_RE = re.compile(r"^\[(\d+)\]\s*", re.MULTILINE)
+    
+    # Models that accept response_format={"type": "json_object"}
+    JSON_MODE_MODELS = ("gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-4o", "gpt-3.5-turbo")
+    
+    # Specifications shorter than this (as JSON) without custom requirements
+    # are simple enough for the fast model, when one is configured
+    FAST_MODEL_SPEC_LENGTH = 500
+    
+    # Output budget for code generation, growing with the requested capabilities
+    CODE_BASE_TOKENS = 2048
+    CODE_TOKENS_PER_CAPABILITY = 512
+    CODE_MAX_TOKENS = 4000
+    
+    # Connection pool settings for the HTTP clients handed to the SDKs; the
+    # SDKs' own request timeouts are left as they are
+    HTTP_OPTIONS = {
+        "http2": True,
+        "limits": httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    }
+    
+    def __init__(self, model: str = "gpt-4", cache: Optional[LLMCache] = None,
+                 fast_model: Optional[str] = None):
         """
         Initialize the LLM provider
         
         Args:
             model: The LLM model to use (gpt-4 or claude)
+            cache: Optional cache for responses to identical requests
+            fast_model: Optional cheaper model of the same provider to generate
+                code for simple specifications with
         """
         self.model = model
+        self.cache = cache
+        self.fast_model = fast_model
+        self.stats = {"hits": 0, "misses": 0}
         
-        # Initialize API clients
+        # Initialize API clients over a pooled HTTP/2 connection that is
+        # reused by every request this provider makes. Only the SDK for the
+        # configured model is imported, since each adds noticeably to startup.
         if self.model.startswith("gpt"):
-            self.client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            import openai
+            self.client = openai.OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=openai.DefaultHttpxClient(**self.HTTP_OPTIONS)
+            )
         elif self.model.startswith("claude"):
-            self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+            import anthropic
+            self.client = anthropic.Anthropic(
+                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                http_client=anthropic.DefaultHttpxClient(**self.HTTP_OPTIONS)
+            )
         else:
             raise ValueError(f"Unsupported model: {model}")
+        
+        # Async client, created on first use of the async methods
+        self._async_client = None
+        
+        # Async requests currently being sent, so identical concurrent calls
+        # share one API call
+        self._inflight: Dict[str, "asyncio.Task[str]"] = {}
     
     def generate(self, prompt: str, system_prompt: Optional[str] = None, 
-                 temperature: float = 0.7, max_tokens: int = 4000) -> str:
+                 temperature: float = 0.7, max_tokens: int = 4000, json_mode: bool = False,
+                 model_override: Optional[str] = None) -> str:
         """
         Generate text using the configured LLM
         
@@ -41,54 +101,417 @@ class LLMProvider:
             system_prompt: Optional system prompt for context
             temperature: Controls randomness (0 to 1)
             max_tokens: Maximum number of tokens to generate
+            json_mode: Constrain the output to a JSON object, where the model supports it
+            model_override: Model to use for this call instead of the configured one
+            
+        Returns:
+            Generated text from the LLM
+        """
+        return "".join(self.generate_stream(
+            prompt, system_prompt, temperature, max_tokens, json_mode, model_override
+        ))
+    
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 4000,
+                        json_mode: bool = False, model_override: Optional[str] = None) -> Iterator[str]:
+        """
+        Generate text using the configured LLM, yielding it as it arrives
+        
+        Args:
+            prompt: The user prompt to send to the LLM
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0 to 1)
+            max_tokens: Maximum number of tokens to generate
+            json_mode: Constrain the output to a JSON object, where the model supports it
+            model_override: Model to use for this call instead of the configured one
+            
+        Yields:
+            Chunks of generated text from the LLM
+        """
+        request = self._build_request(
+            prompt, system_prompt, temperature, max_tokens, json_mode, model_override
+        )
+        key = self._cache_key(request)
+        if key is not None:
+            cached = self._get_cached(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        chunks = []
+        if self.model.startswith("gpt"):
+            response = self.client.chat.completions.create(**request, stream=True)
+            for chunk in response:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    chunks.append(text)
+                    yield text
+        else:
+            with self.client.messages.stream(**request) as stream:
+                for text in stream.text_stream:
+                    chunks.append(text)
+                    yield text
+        
+        if key is not None:
+            self.cache.set(key, "".join(chunks))
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 4000,
+                        json_mode: bool = False, model_override: Optional[str] = None) -> str:
+        """
+        Generate text using the configured LLM without blocking the event loop
+        
+        Independent calls can be run concurrently with asyncio.gather.
+        
+        Args:
+            prompt: The user prompt to send to the LLM
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0 to 1)
+            max_tokens: Maximum number of tokens to generate
+            json_mode: Constrain the output to a JSON object, where the model supports it
+            model_override: Model to use for this call instead of the configured one
+            
+        Returns:
+            Generated text from the LLM
+        """
+        request = self._build_request(
+            prompt, system_prompt, temperature, max_tokens, json_mode, model_override
+        )
+        key = self._cache_key(request)
+        if key is not None:
+            cached = self._get_cached(key)
+            if cached is not None:
+                return cached
+        
+        # Join an identical request that is already in flight instead of sending another
+        inflight_key = hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._asend(request, key))
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+        
+        # Shielded, so a cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+    
+    async def _asend(self, request: Dict[str, Any], key: Optional[str]) -> str:
+        """
+        Send a request with the async client and cache the response
+        
+        Args:
+            request: Keyword arguments for the API client's create call
+            key: Cache key of the request, or None if it isn't cached
             
         Returns:
             Generated text from the LLM
         """
+        client = self._get_async_client()
+        if self.model.startswith("gpt"):
+            response = await client.chat.completions.create(**request)
+        else:
+            response = await client.messages.create(**request)
+        
+        text = self._extract_text(response)
+        if key is not None:
+            self.cache.set(key, text)
+        return text
+    
+    def _cache_key(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Compute the cache key for a request
+        
+        Args:
+            request: Keyword arguments for the API client's create call
+            
+        Returns:
+            Cache key, or None if caching is disabled or doesn't apply
+        """
+        if self.cache is None:
+            return None
+        
+        messages = request["messages"]
+        if "system" in request:
+            messages = [{"role": "system", "content": request["system"]}] + messages
+        return self.cache.cache_key(request["model"], messages, request["temperature"])
+    
+    def _get_cached(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response and record the hit or miss
+        
+        Args:
+            key: Cache key of the request
+            
+        Returns:
+            Cached response, or None on a miss
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+        else:
+            self.stats["misses"] += 1
+        return cached
+    
+    async def aclose(self) -> None:
+        """
+        Close the async API client and its connections
+        
+        The client is bound to the event loop it was first used on; a new one
+        is created on the next async call.
+        """
+        if self._async_client is not None:
+            client, self._async_client = self._async_client, None
+            await client.close()
+    
+    def _get_async_client(self):
+        """
+        Get the async API client, creating it on first use
+        
+        Returns:
+            Async OpenAI or Anthropic client
+        """
+        if self._async_client is None:
+            if self.model.startswith("gpt"):
+                import openai
+                self._async_client = openai.AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    http_client=openai.DefaultAsyncHttpxClient(**self.HTTP_OPTIONS)
+                )
+            else:
+                import anthropic
+                self._async_client = anthropic.AsyncAnthropic(
+                    api_key=os.getenv("ANTHROPIC_API_KEY"),
+                    http_client=anthropic.DefaultAsyncHttpxClient(**self.HTTP_OPTIONS)
+                )
+        return self._async_client
+    
+    def _build_request(self, prompt: str, system_prompt: Optional[str],
+                       temperature: float, max_tokens: int, json_mode: bool = False,
+                       model_override: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the request arguments for the configured model's API
+        
+        Args:
+            prompt: The user prompt to send to the LLM
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0 to 1)
+            max_tokens: Maximum number of tokens to generate
+            json_mode: Constrain the output to a JSON object, where the model supports it
+            model_override: Model to use for this call instead of the configured one
+            
+        Returns:
+            Keyword arguments for the API client's create call
+        """
+        model = model_override or self.model
         if self.model.startswith("gpt"):
             messages = []
             if system_prompt:
                 messages.append({"role": "system", "content": system_prompt})
             messages.append({"role": "user", "content": prompt})
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+            request = {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            }
+            if json_mode and model.startswith(self.JSON_MODE_MODELS):
+                request["response_format"] = {"type": "json_object"}
+            return request
+        
+        return {
+            "model": model,
+            "system": system_prompt or "",
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+    
+    def _extract_text(self, response: Any) -> str:
+        """
+        Extract the generated text from an API response
+        
+        Args:
+            response: Response returned by the API client
+            
+        Returns:
+            Generated text from the LLM
+        """
+        if self.model.startswith("gpt"):
             return response.choices[0].message.content
+        return response.content[0].text
+    
+    def generate_batch(self, prompts: List[str], system_prompt: Optional[str] = None,
+                       temperature: float = 0.7, max_tokens: int = 4000) -> List[str]:
+        """
+        Generate answers for several independent prompts with a single request
+        
+        Args:
+            prompts: The user prompts to send to the LLM
+            system_prompt: Optional system prompt shared by all prompts
+            temperature: Controls randomness (0 to 1)
+            max_tokens: Maximum number of tokens to generate for all answers
             
-        elif self.model.startswith("claude"):
-            system = system_prompt or ""
-            response = self.client.messages.create(
-                model=self.model,
-                system=system,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-            return response.content[0].text
+        Returns:
+            Answers in the same order as the prompts, empty for any the LLM skipped
+        """
+        if not prompts:
+            return []
+        
+        batch_prompt, batch_system_prompt = self._build_batch_prompts(prompts, system_prompt)
+        response = self.generate(batch_prompt, batch_system_prompt, temperature, max_tokens)
+        return self._split_batch_answers(response, len(prompts))
+    
+    async def agenerate_batch(self, prompts: List[str], system_prompt: Optional[str] = None,
+                              temperature: float = 0.7, max_tokens: int = 4000) -> List[str]:
+        """
+        Generate answers for several independent prompts with a single request
+        without blocking the event loop
+        
+        Args:
+            prompts: The user prompts to send to the LLM
+            system_prompt: Optional system prompt shared by all prompts
+            temperature: Controls randomness (0 to 1)
+            max_tokens: Maximum number of tokens to generate for all answers
+            
+        Returns:
+            Answers in the same order as the prompts, empty for any the LLM skipped
+        """
+        if not prompts:
+            return []
+        
+        batch_prompt, batch_system_prompt = self._build_batch_prompts(prompts, system_prompt)
+        response = await self.agenerate(batch_prompt, batch_system_prompt, temperature, max_tokens)
+        return self._split_batch_answers(response, len(prompts))
     
-    def generate_code(self, specifications: Dict[str, Any], language: str = "python") -> str:
+    def _build_batch_prompts(self, prompts: List[str], system_prompt: Optional[str]) -> Tuple[str, str]:
+        """
+        Combine several prompts into one tagged request
+        
+        Args:
+            prompts: The user prompts to send to the LLM
+            system_prompt: Optional system prompt shared by all prompts
+            
+        Returns:
+            Tuple of the batched user prompt and system prompt
+        """
+        batch_prompt = "\n".join(f"[{i}] {prompt}" for i, prompt in enumerate(prompts, 1))
+        batch_system_prompt = "\n\n".join(filter(None, [system_prompt, self.BATCH_INSTRUCTIONS]))
+        return batch_prompt, batch_system_prompt
+    
+    def _split_batch_answers(self, response: str, count: int) -> List[str]:
+        """
+        Split a batched response into the answers for each prompt
+        
+        Args:
+            response: Response to a batched request
+            count: Number of prompts in the batch
+            
+        Returns:
+            Answers in the same order as the prompts, empty for any the LLM skipped
+        """
+        # Splitting on the tags yields [preamble, index, answer, index, answer, ...]
+        answers = [""] * count
+        parts = self._BATCH_ANSWER_RE.split(response)
+        for index, answer in zip(parts[1::2], parts[2::2]):
+            position = int(index) - 1
+            if 0 <= position < count:
+                answers[position] = answer.strip()
+        
+        return answers
+    
+    def generate_code(self, specifications: Dict[str, Any], language: str = "python",
+                      prompt: Optional[str] = None,
+                      stream_callback: Optional[Callable[[str], None]] = None) -> str:
         """
         Generate code based on specifications
         
         Args:
             specifications: Dictionary containing specifications for the code
             language: Programming language to generate (python or javascript)
+            prompt: Pre-rendered prompt to use instead of the generic one
+            stream_callback: Optional function called with each chunk of code as it arrives
+            
+        Returns:
+            Generated code as a string
+        """
+        prompt, system_prompt = self._build_code_prompts(specifications, language, prompt)
+        model, max_tokens = self._route_code_request(specifications)
+        
+        chunks = []
+        for chunk in self.generate_stream(prompt, system_prompt, temperature=0.2,
+                                          max_tokens=max_tokens, model_override=model):
+            if stream_callback is not None:
+                stream_callback(chunk)
+            chunks.append(chunk)
+        return "".join(chunks)
+    
+    async def agenerate_code(self, specifications: Dict[str, Any], language: str = "python",
+                             prompt: Optional[str] = None) -> str:
+        """
+        Generate code based on specifications without blocking the event loop
+        
+        Args:
+            specifications: Dictionary containing specifications for the code
+            language: Programming language to generate (python or javascript)
+            prompt: Pre-rendered prompt to use instead of the generic one
             
         Returns:
             Generated code as a string
         """
+        prompt, system_prompt = self._build_code_prompts(specifications, language, prompt)
+        model, max_tokens = self._route_code_request(specifications)
+        return await self.agenerate(prompt, system_prompt, temperature=0.2,
+                                    max_tokens=max_tokens, model_override=model)
+    
+    def _route_code_request(self, specifications: Dict[str, Any]) -> Tuple[Optional[str], int]:
+        """
+        Pick the model and output budget for generating code from specifications
+        
+        If a fast model is configured, simple specifications that don't name a
+        model of their own go to it.
+        
+        Args:
+            specifications: Dictionary containing specifications for the code
+            
+        Returns:
+            Tuple of the model override (None for the configured model) and max_tokens
+        """
+        model = None
+        if (self.fast_model
+                and not specifications.get("model")
+                and not specifications.get("custom_requirements")
+                and len(json.dumps(specifications, default=str)) < self.FAST_MODEL_SPEC_LENGTH):
+            model = self.fast_model
+        logger.info("Generating code with %s", model or self.model)
+        
+        max_tokens = min(
+            self.CODE_MAX_TOKENS,
+            self.CODE_BASE_TOKENS + self.CODE_TOKENS_PER_CAPABILITY * len(specifications.get("capabilities") or [])
+        )
+        return model, max_tokens
+    
+    def _build_code_prompts(self, specifications: Dict[str, Any], language: str,
+                            prompt: Optional[str]) -> Tuple[str, str]:
+        """
+        Build the user and system prompts for code generation
+        
+        Args:
+            specifications: Dictionary containing specifications for the code
+            language: Programming language to generate (python or javascript)
+            prompt: Pre-rendered prompt to use instead of the generic one
+            
+        Returns:
+            Tuple of the user prompt and the system prompt
+        """
         system_prompt = f"""You are an expert {language} developer specializing in LLM agents.
 Your task is to generate clean, well-documented {language} code based on the provided specifications.
 Follow best practices and include appropriate error handling.
 Only output the code without any explanations or markdown formatting."""
         
-        prompt = f"""Generate {language} code for an LLM agent with the following specifications:
-{specifications}
+        if prompt is None:
+            prompt = f"""Generate {language} code for an LLM agent with the following specifications:
+{json.dumps(specifications, indent=2, default=str)}
 
 The code should be complete and ready to run, including all necessary imports and class/function definitions."""
         
-        return self.generate(prompt, system_prompt, temperature=0.2)
+        return prompt, system_prompt
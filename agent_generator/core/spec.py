@@ -0,0 +1,54 @@
+"""
+Agent specification module
+"""
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Any, Tuple
+
+
+@dataclass(slots=True, frozen=True)
+class AgentSpec:
+    """
+    Immutable, hashable specifications for an agent
+    """
+    
+    name: str
+    description: str
+    language: str = "python"
+    framework: Optional[str] = None
+    capabilities: Tuple[str, ...] = ()
+    use_case: str = ""
+    model: Optional[str] = None
+    custom_requirements: Optional[str] = None
+    api_keys: Optional[Dict[str, str]] = None
+    
+    def canonical(self) -> str:
+        """
+        Serialize the specifications as canonical JSON
+        
+        Returns:
+            JSON with sorted keys, identical for equal specifications
+        """
+        return json.dumps(asdict(self), sort_keys=True)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the dictionary form used by the engine
+        
+        Unset optional fields are left out, as they are when collected by hand.
+        
+        Returns:
+            Dictionary containing the specifications
+        """
+        return {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in asdict(self).items()
+            if value is not None
+        }
+    
+    def __hash__(self) -> int:
+        return hash(self.canonical())
+    
+    def __str__(self) -> str:
+        return self.canonical()
@@ -3,10 +3,15 @@ Command-line interface for the agent generation engine
 """
 
 import os
+import re
+import sys
 import json
 from typing import Dict, Any, List, Optional
 
+import questionary
+
 from agent_generator.core.engine import AgentGenerationEngine
+from agent_generator.core.spec import AgentSpec
 
 
 class CLI:
@@ -14,6 +19,9 @@ class CLI:
     Command-line interface for the agent generation engine
     """
     
+    # Specification fields that must be strings (or null) in spec files
+    STRING_FIELDS = ("name", "description", "language", "framework", "use_case", "model", "custom_requirements")
+    
     def __init__(self, engine: AgentGenerationEngine):
         """
         Initialize the CLI
@@ -23,10 +31,20 @@ class CLI:
         """
         self.engine = engine
     
-    def run(self):
+    def run(self, spec_file: Optional[str] = None, specs_dir: Optional[str] = None,
+            output_dir: str = "generated_agents"):
         """
         Run the CLI
+        
+        Args:
+            spec_file: Optional JSON file with one specification or a list of them
+            specs_dir: Optional directory of such JSON files
+            output_dir: Directory to save agents generated from spec files to
         """
+        if spec_file or specs_dir:
+            self._run_batch(spec_file, specs_dir, output_dir)
+            return
+        
         print("=" * 50)
         print("LLM Agent Generation Engine - CLI")
         print("=" * 50)
@@ -35,9 +53,13 @@ class CLI:
         # Collect specifications
         specifications = self._collect_specifications()
         
-        # Generate the agent
-        print("\nGenerating agent code...")
-        agent_data = self.engine.generate_agent(specifications)
+        # Generate the agent, echoing the code as the LLM streams it
+        print("\nGenerating agent code...\n")
+        agent_data = self.engine.generate_agent(
+            specifications,
+            stream_callback=lambda chunk: print(chunk, end="", flush=True)
+        )
+        print()
         
         # Save the agent
         output_dir = self._get_output_directory()
@@ -46,101 +68,146 @@ class CLI:
         print(f"\nAgent successfully generated and saved to: {saved_path}")
         print("\nYou can now use your agent by following the instructions in the README.md file.")
     
-    def _collect_specifications(self) -> Dict[str, Any]:
+    def _run_batch(self, spec_file: Optional[str], specs_dir: Optional[str], output_dir: str):
         """
-        Collect agent specifications from the user
+        Generate agents from specification files without prompting
         
-        Returns:
-            Dictionary containing user specifications for the agent
+        Prints a JSON array with the paths of the saved agents, with null for
+        agents that failed to generate; their errors are printed to stderr.
+        
+        Args:
+            spec_file: Optional JSON file with one specification or a list of them
+            specs_dir: Optional directory of such JSON files
+            output_dir: Directory to save the agents to
         """
-        specifications = {}
-        
-        # Basic information
-        print("\n--- Basic Information ---")
-        specifications["name"] = input("Agent name: ")
-        specifications["description"] = input("Agent description: ")
-        specifications["language"] = self._select_option(
-            "Programming language", ["python", "javascript"], "python"
-        )
+        paths = []
+        if spec_file:
+            paths.append(spec_file)
+        if specs_dir:
+            paths.extend(sorted(
+                entry.path for entry in os.scandir(specs_dir)
+                if entry.is_file() and entry.name.endswith(".json")
+            ))
+        
+        specifications_list = []
+        for path in paths:
+            specifications_list.extend(self._load_specifications(path))
+        
+        agents = self.engine.generate_agents_batch(specifications_list)
+        
+        saved_paths = []
+        for i, agent_data in enumerate(agents, 1):
+            name = re.sub(r"[^A-Za-z0-9_-]+", "_", agent_data["specifications"].get("name") or "agent")
+            if agent_data.get("error"):
+                print(f"Agent {i} ({name}) failed: {agent_data['error']}", file=sys.stderr)
+                saved_paths.append(None)
+                continue
+            saved_paths.append(self.engine.save_agent(agent_data, os.path.join(output_dir, f"{i:03d}_{name}")))
+        
+        print(json.dumps(saved_paths, indent=2))
+    
+    def _load_specifications(self, path: str) -> List[Dict[str, Any]]:
+        """
+        Load agent specifications from a JSON file
         
-        # Framework selection
-        print("\n--- Framework Selection ---")
-        print("Available frameworks:")
-        print("1. LlamaIndex - Best for document retrieval and RAG applications")
-        print("2. LangChain - Best for workflow and chain-of-thought operations")
-        print("3. SmallAgents - Best for lightweight, specific-purpose agents")
-        print("4. OpenAI Assistants - Best for leveraging OpenAI's agent capabilities")
-        print("5. Auto-select based on requirements")
-        
-        framework_choice = input("Select a framework (1-5, default: 5): ").strip() or "5"
-        framework_map = {
-            "1": "llamaindex",
-            "2": "langchain",
-            "3": "smallagents",
-            "4": "openai_assistants"
-        }
+        Args:
+            path: Path to a JSON file with one specification or a list of them
+            
+        Returns:
+            List of dictionaries containing agent specifications
+            
+        Raises:
+            ValueError: If the file doesn't hold a specification object or a list of them,
+                or a specification field has the wrong type
+        """
+        with open(path, encoding="utf-8") as f:
+            specifications = json.load(f)
+        
+        if isinstance(specifications, dict):
+            specifications = [specifications]
+        elif not isinstance(specifications, list):
+            raise ValueError(f"{path}: expected a specification object or a list of them")
+        
+        for i, entry in enumerate(specifications):
+            if not isinstance(entry, dict):
+                raise ValueError(f"{path}: specification {i} is not an object")
+            for key in self.STRING_FIELDS:
+                if entry.get(key) is not None and not isinstance(entry[key], str):
+                    raise ValueError(f"{path}: specification {i}: {key} must be a string")
+            capabilities = entry.get("capabilities")
+            if capabilities is not None and not (
+                isinstance(capabilities, list) and all(isinstance(capability, str) for capability in capabilities)
+            ):
+                raise ValueError(f"{path}: specification {i}: capabilities must be a list of strings")
+        return specifications
+    
+    def _collect_specifications(self) -> AgentSpec:
+        """
+        Collect agent specifications from the user
         
-        if framework_choice in framework_map:
-            specifications["framework"] = framework_map[framework_choice]
-        
-        # Capabilities
-        print("\n--- Agent Capabilities ---")
-        capabilities = []
-        print("Select agent capabilities (comma-separated numbers):")
-        print("1. Document retrieval")
-        print("2. Question answering")
-        print("3. Web browsing")
-        print("4. Tool usage")
-        print("5. Memory/context retention")
-        print("6. Chain-of-thought reasoning")
-        print("7. Custom capability")
-        
-        capability_choices = input("Capabilities (e.g., 1,3,4): ").strip()
-        capability_map = {
-            "1": "document_retrieval",
-            "2": "question_answering",
-            "3": "web_browsing",
-            "4": "tool_usage",
-            "5": "memory_retention",
-            "6": "chain_of_thought"
+        Returns:
+            User specifications for the agent
+        """
+        # Basic information, asked as a single form
+        answers = questionary.form(
+            name=questionary.text("Agent name:"),
+            description=questionary.text("Agent description:"),
+            language=questionary.select("Programming language:", choices=["python", "javascript"]),
+            framework=questionary.select("Framework:", choices=[
+                questionary.Choice("Auto-select based on requirements", value="auto"),
+                questionary.Choice("LlamaIndex - Best for document retrieval and RAG applications", value="llamaindex"),
+                questionary.Choice("LangChain - Best for workflow and chain-of-thought operations", value="langchain"),
+                questionary.Choice("SmallAgents - Best for lightweight, specific-purpose agents", value="smallagents"),
+                questionary.Choice("OpenAI Assistants - Best for leveraging OpenAI's agent capabilities",
+                                   value="openai_assistants")
+            ]),
+            capabilities=questionary.checkbox("Agent capabilities:", choices=[
+                questionary.Choice("Document retrieval", value="document_retrieval"),
+                questionary.Choice("Question answering", value="question_answering"),
+                questionary.Choice("Web browsing", value="web_browsing"),
+                questionary.Choice("Tool usage", value="tool_usage"),
+                questionary.Choice("Memory/context retention", value="memory_retention"),
+                questionary.Choice("Chain-of-thought reasoning", value="chain_of_thought"),
+                questionary.Choice("Custom capability", value="custom")
+            ]),
+            use_case=questionary.text("Describe the specific use case for this agent:")
+        ).unsafe_ask()
+        
+        specifications = {
+            "name": answers["name"],
+            "description": answers["description"],
+            "language": answers["language"]
         }
+        if answers["framework"] != "auto":
+            specifications["framework"] = answers["framework"]
         
-        for choice in capability_choices.split(","):
-            choice = choice.strip()
-            if choice in capability_map:
-                capabilities.append(capability_map[choice])
-            elif choice == "7":
-                custom_capability = input("Enter custom capability: ").strip()
-                capabilities.append(custom_capability)
-        
-        specifications["capabilities"] = capabilities
-        
-        # Use case
-        print("\n--- Use Case ---")
-        specifications["use_case"] = input("Describe the specific use case for this agent: ")
+        capabilities = [capability for capability in answers["capabilities"] if capability != "custom"]
+        if "custom" in answers["capabilities"]:
+            capabilities.append(questionary.text("Enter custom capability:").unsafe_ask().strip())
+        specifications["capabilities"] = tuple(capabilities)
+        specifications["use_case"] = answers["use_case"]
         
         # Advanced options
-        print("\n--- Advanced Options ---")
         if self._confirm("Do you want to configure advanced options?"):
             # Model selection
-            specifications["model"] = self._select_option(
-                "LLM model", ["gpt-4", "gpt-3.5-turbo", "claude-2", "claude-instant"], "gpt-4"
-            )
+            specifications["model"] = questionary.select(
+                "LLM model:", choices=["gpt-4", "gpt-3.5-turbo", "claude-2", "claude-instant"]
+            ).unsafe_ask()
             
             # Custom requirements
             if self._confirm("Do you have any custom requirements?"):
-                specifications["custom_requirements"] = input("Enter custom requirements: ")
+                specifications["custom_requirements"] = questionary.text("Enter custom requirements:").unsafe_ask()
             
             # API keys
             if self._confirm("Do you want to configure API keys now?"):
                 api_keys = {}
-                api_keys["openai"] = input("OpenAI API key (leave blank to skip): ")
-                api_keys["anthropic"] = input("Anthropic API key (leave blank to skip): ")
+                api_keys["openai"] = questionary.text("OpenAI API key (leave blank to skip):").unsafe_ask()
+                api_keys["anthropic"] = questionary.text("Anthropic API key (leave blank to skip):").unsafe_ask()
                 
                 # Only add non-empty keys
                 specifications["api_keys"] = {k: v for k, v in api_keys.items() if v}
         
-        return specifications
+        return AgentSpec(**specifications)
     
     def _get_output_directory(self) -> str:
         """
@@ -155,9 +222,15 @@ class CLI:
         # Ensure the directory doesn't already exist
         if os.path.exists(output_dir):
             if not self._confirm(f"Directory {output_dir} already exists. Overwrite?"):
-                i = 1
-                while os.path.exists(f"{output_dir}_{i}"):
-                    i += 1
+                # Take the suffix after the highest one in use, listing the
+                # parent directory once instead of probing each candidate
+                parent = os.path.dirname(output_dir) or "."
+                suffix_re = re.compile(rf"{re.escape(os.path.basename(output_dir))}_(\d+)$")
+                used = {
+                    int(m.group(1)) for entry in os.scandir(parent)
+                    if (m := suffix_re.match(entry.name))
+                }
+                i = (max(used) + 1) if used else 1
                 output_dir = f"{output_dir}_{i}"
                 print(f"Using {output_dir} instead.")
         
@@ -173,33 +246,4 @@ class CLI:
         Returns:
             True if confirmed, False otherwise
         """
-        response = input(f"{message} (y/n): ").strip().lower()
-        return response == "y" or response == "yes"
-    
-    def _select_option(self, name: str, options: List[str], default: str) -> str:
-        """
-        Let the user select an option from a list
-        
-        Args:
-            name: Name of the option
-            options: List of available options
-            default: Default option
-            
-        Returns:
-            Selected option
-        """
-        print(f"\n{name} options:")
-        for i, option in enumerate(options, 1):
-            print(f"{i}. {option}")
-        
-        default_idx = options.index(default) + 1
-        choice = input(f"Select {name.lower()} (1-{len(options)}, default: {default_idx}): ").strip() or str(default_idx)
-        
-        try:
-            idx = int(choice) - 1
-            if 0 <= idx < len(options):
-                return options[idx]
-        except ValueError:
-            pass
-        
-        return default
+        return questionary.confirm(message, default=False).unsafe_ask()
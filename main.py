@@ -9,27 +9,46 @@ import argparse
 from dotenv import load_dotenv
 
 from agent_generator.core.engine import AgentGenerationEngine
+from agent_generator.core.llm_cache import LLMCache
 from agent_generator.ui.cli import CLI
 
-# Load environment variables from .env file
-load_dotenv()
+def _load_env():
+    """Load environment variables from .env file, unless an API key is already set"""
+    # Deployments that inject the keys into the environment skip reading .env
+    if os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY"):
+        return
+    load_dotenv()
 
 def main():
     """Main entry point for the application"""
+    _load_env()
+    
     parser = argparse.ArgumentParser(description="LLM Agent Generation Engine")
     parser.add_argument("--ui", choices=["cli", "web"], default="cli",
                         help="User interface type (cli or web)")
     parser.add_argument("--model", choices=["gpt-4", "claude"], default="gpt-4",
                         help="LLM model to use for generation")
+    parser.add_argument("--llm-cache", action="store_true",
+                        help="Cache low-temperature LLM responses on disk")
+    parser.add_argument("--fast-model",
+                        help="Cheaper model of the same provider to generate simple agents with "
+                             "(e.g. gpt-3.5-turbo); off by default")
+    parser.add_argument("--spec-file",
+                        help="JSON file with one agent specification or a list of them")
+    parser.add_argument("--specs-dir",
+                        help="Directory of JSON specification files")
+    parser.add_argument("--output-dir", default="generated_agents",
+                        help="Directory to save agents generated from spec files to")
     args = parser.parse_args()
     
     # Initialize the agent generation engine
-    engine = AgentGenerationEngine(model=args.model)
+    cache = LLMCache() if args.llm_cache else None
+    engine = AgentGenerationEngine(model=args.model, cache=cache, fast_model=args.fast_model)
     
     # Launch the appropriate UI
     if args.ui == "cli":
         ui = CLI(engine)
-        ui.run()
+        ui.run(spec_file=args.spec_file, specs_dir=args.specs_dir, output_dir=args.output_dir)
     else:
         ui = WebUI(engine)
         ui.run()